@@ -1,16 +1,23 @@
 #!/usr/bin/env python3
-import csv
-import io
-import json
+import gzip
+import hashlib
+import math
 import threading
 import time
+from array import array
 from datetime import datetime, date, time as dtime, timedelta
 from zoneinfo import ZoneInfo
 
+import diskcache
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import serial
 import serial.tools.list_ports
 from flask import Flask, jsonify, request, redirect, url_for, Response
+from flask_compress import Compress
+from waitress import serve
 
 # ----------------------------
 # CONFIG
@@ -20,18 +27,33 @@ PRICE_THRESHOLD_EUR_PER_KWH = 0.20     # 20 ct/kWh (you can change this)
 AREA_FIELD = "lt"                      # Lithuania
 ELERING_CSV_URL = "https://dashboard.elering.ee/api/nps/price/csv"
 
+# On-disk cache for fetched day-ahead prices
+PRICE_CACHE_DIR = "./.price_cache"
+PRICE_CACHE_TTL_SEC = 7 * 86400        # past/future days: prices are final once published
+PRICE_CACHE_TODAY_TTL_SEC = 3600       # today: keep short in case of late amendments
+
 # Arduino serial
 BAUDRATE = 115200
+SERIAL_READ_TIMEOUT_SEC = 0.3
+SERIAL_WRITE_TIMEOUT_SEC = 0.2
 # "/dev/ttyACM0"
 SERIAL_PORT = None
 
 # How often to poll Arduino for state (seconds)
 STATE_POLL_SEC = 10
 
+# How often to retry fetching prices while today's schedule is empty (seconds)
+SCHEDULE_RETRY_SEC = 30 * 60
+
 # ----------------------------
 # STATE
 # ----------------------------
 app = Flask(__name__)
+app.config["COMPRESS_MIN_SIZE"] = 500
+app.config["COMPRESS_ALGORITHM"] = ["br", "gzip"]
+# JSON only: home() serves the page pre-gzipped (or plain) itself
+app.config["COMPRESS_MIMETYPES"] = ["application/json"]
+Compress(app)
 
 state_lock = threading.Lock()
 
@@ -44,10 +66,28 @@ runtime_state = {
     "override_mode": "schedule",  # "schedule" or "force_grid"
     "current_price": None,
     "current_price_time": None,
+    "expensive_mask": 0,          # bit h set = hour h is above threshold (charger off)
 }
 
-# schedule: dict[hour_start_local_iso] = {"price": float, "action":"charge_on"|"charge_off"}
-day_schedule = {}
+# schedule: list indexed by local hour 0..23 -> {"price": float, "action":"charge_on"|"charge_off"} or None
+day_schedule = [None] * 24
+schedule_date = None   # local date day_schedule belongs to (None = not loaded)
+
+# Pre-rendered /api/schedule response (guarded by state_lock)
+_schedule_cache = {"etag": None, "payload": None}
+
+# Serialized runtime_state; the list slot is swapped on every write, so /api/state
+# can read it without taking state_lock (single reference assignment is atomic)
+_state_json_ref = [orjson.dumps(runtime_state)]
+
+def _publish_state_locked():
+    """
+    Re-serialize runtime_state for /api/state. Caller must hold state_lock.
+    """
+    _state_json_ref[0] = orjson.dumps(runtime_state)
+
+# Wakes price_scheduler before the next hour boundary (reload/override)
+_wake = threading.Event()
 
 # ----------------------------
 # SERIAL / ARDUINO
@@ -57,6 +97,9 @@ class ArduinoController:
         self.port = port
         self.baud = baud
         self.ser = None
+        self._reader_thread = None
+        # Called as on_state(on, ch) from the serial thread for every STATE line
+        self.on_state = None
         self._open_serial()
 
     def _detect_port(self):
@@ -73,7 +116,10 @@ class ArduinoController:
             print("[SERIAL] No Arduino serial port found.")
             return
         try:
-            self.ser = serial.Serial(port, self.baud, timeout=1)
+            self.ser = serial.Serial(port, self.baud,
+                                     timeout=SERIAL_READ_TIMEOUT_SEC,
+                                     write_timeout=SERIAL_WRITE_TIMEOUT_SEC)
+            self._set_low_latency()
             time.sleep(2.0)  # allow Nano to reset
             self.port = port
             print(f"[SERIAL] Connected to {port}")
@@ -81,6 +127,17 @@ class ArduinoController:
             print(f"[SERIAL] Open failed on {port}: {e}")
             self.ser = None
 
+    def _set_low_latency(self):
+        """
+        Linux: set ASYNC_LOW_LATENCY on the tty so the driver doesn't batch
+        input behind its latency timer (~16 ms on FTDI). Silently skipped
+        on non-POSIX platforms and ports that reject the ioctl (most CDC-ACM).
+        """
+        try:
+            self.ser.set_low_latency_mode(True)
+        except (AttributeError, ValueError):
+            pass
+
     def is_open(self):
         return self.ser is not None and self.ser.is_open
 
@@ -94,35 +151,57 @@ class ArduinoController:
             raise RuntimeError("Serial not open")
         self.ser.write((line.strip() + "\n").encode("utf-8"))
 
-    def read_line(self, timeout=0.3):
-        self._ensure_open()
-        if not self.is_open():
-            return None
-        end = time.time() + timeout
-        while time.time() < end:
-            if self.ser.in_waiting:
-                return self.ser.readline().decode("utf-8", errors="ignore").strip()
-            time.sleep(0.01)
-        return None
-
-    def query_state(self):
+    def start(self):
         """
-        Ask Arduino: 'STATE?' -> 'STATE ON=1 CH=1'
+        Start the serial thread (reads replies, polls STATE?, reconnects).
         """
-        try:
-            self.send_line("STATE?")
-            # Read a few lines to find the STATE reply
-            for _ in range(10):
-                ln = self.read_line(timeout=0.5)
-                if not ln:
-                    continue
-                if ln.startswith("STATE "):
-                    on = 1 if "ON=1" in ln else 0
-                    ch = 1 if "CH=1" in ln else 0
-                    return bool(on), bool(ch)
-        except Exception as e:
-            print(f"[SERIAL] query_state error: {e}")
-        return None, None
+        if self._reader_thread is not None and self._reader_thread.is_alive():
+            return
+        self._reader_thread = threading.Thread(target=self._reader_loop, daemon=True)
+        self._reader_thread.start()
+
+    def _reader_loop(self):
+        """
+        Owns all reads from the port: ingests lines and reports every STATE,
+        whether it answers STATE? or follows a command (Arduino publishes after OK).
+        Sends STATE? every STATE_POLL_SEC, which also reopens a lost port.
+        """
+        buf = bytearray()
+        next_poll = 0.0
+        while True:
+            now = time.monotonic()
+            if now >= next_poll:
+                next_poll = now + STATE_POLL_SEC
+                try:
+                    self.send_line("STATE?")
+                except Exception as e:
+                    print(f"[SERIAL] poll error: {e}")
+            ser = self.ser
+            if ser is None or not ser.is_open:
+                buf.clear()
+                time.sleep(max(0.0, next_poll - time.monotonic()))
+                continue
+            try:
+                # Drain whatever is buffered in one read; block for 1 byte when idle
+                buf += ser.read(ser.in_waiting or 1)
+            except Exception as e:
+                print(f"[SERIAL] read error: {e}")
+                try:
+                    ser.close()
+                except Exception:
+                    pass
+                continue
+            while b"\n" in buf:
+                line, _, rest = buf.partition(b"\n")
+                buf = bytearray(rest)
+                self._dispatch(line.decode("utf-8", errors="ignore").strip())
+
+    def _dispatch(self, ln: str):
+        if ln.startswith("STATE "):
+            on = 1 if "ON=1" in ln else 0
+            ch = 1 if "CH=1" in ln else 0
+            if self.on_state is not None:
+                self.on_state(bool(on), bool(ch))
 
     def set_inverter(self, enabled: bool):
         try:
@@ -150,14 +229,27 @@ class ArduinoController:
 
 
 arduino = ArduinoController(SERIAL_PORT, BAUDRATE)
-runtime_state["arduino_port"] = arduino.port
+with state_lock:
+    runtime_state["arduino_port"] = arduino.port
+    _publish_state_locked()
 
 # ----------------------------
 # PRICE FETCH
 # ----------------------------
-def fetch_day_prices_local(target_date: date):
+_price_cache = diskcache.Cache(PRICE_CACHE_DIR)
+
+# Shared session: keeps the TLS connection to Elering alive and retries transient 5xx
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(max_retries=Retry(
+    total=3, backoff_factor=0.3, status_forcelist=[500, 502, 503, 504])))
+
+# Single-flight: concurrent fetches of the same date wait for the first one's result
+_fetch_lock = threading.Lock()
+_fetch_inflight = {}   # date -> {"done": Event, "result": dict|None, "error": Exception|None}
+
+def _download_day_prices(target_date: date):
     """
-    Returns list of (hour_start_local, eur_per_kwh)
+    Fetch the Elering CSV for target_date; returns array('d') indexed by local hour.
     """
     start_local = datetime.combine(target_date, dtime(0, 0, 0), tzinfo=LOCAL_TZ)
     end_local   = datetime.combine(target_date, dtime(23, 59, 59), tzinfo=LOCAL_TZ)
@@ -168,57 +260,127 @@ def fetch_day_prices_local(target_date: date):
         "end":   end_local.isoformat(),
         "fields": AREA_FIELD,   # "lt" for Lithuania, "pl" not supported; pick the bidding area you buy from
     }
-    r = requests.get(ELERING_CSV_URL, params=params, timeout=15)
-    r.raise_for_status()
-
-    text = r.text
-    rdr = csv.reader(io.StringIO(text), delimiter=';', quotechar='"')
-    rows = list(rdr)
+    target_str = target_date.strftime("%d.%m.%Y")
+    prices = array('d', [math.nan] * 24)
+
+    # Context manager returns the streamed connection to the session pool
+    with _session.get(ELERING_CSV_URL, params=params, timeout=15, stream=True) as r:
+        r.raise_for_status()
+        r.encoding = r.encoding or "utf-8"
+
+        # Fixed schema: "utc_ts";"dd.mm.yyyy HH:MM";"eur_mwh" (comma decimal), so plain
+        # str.split is enough; the hour is sliced out instead of building a datetime
+        for ln in r.iter_lines(decode_unicode=True):
+            parts = ln.replace('"', '').split(";")
+            # skip header/blank rows and rows of other days before any parsing; prices come in
+            # 15-minute steps, keep only each hour's HH:00 row (the price the schedule applies)
+            if (len(parts) < 3 or not parts[0].isdigit() or not parts[1].startswith(target_str)
+                    or parts[1][14:16] != "00"):
+                continue
+            try:
+                hh = int(parts[1][11:13])
+                prices[hh] = float(parts[2].replace(",", ".")) / 1000.0
+            except (ValueError, IndexError):
+                continue
+    return prices
 
-    out = []
-    for rrow in rows:
-        if len(rrow) < 3:
-            continue
-        try:
-            ts_local = datetime.strptime(rrow[1], "%d.%m.%Y %H:%M").replace(tzinfo=LOCAL_TZ)
-            eur_mwh = float(rrow[2].replace(",", "."))
-            eur_kwh = eur_mwh / 1000.0
-            if ts_local.date() == target_date:
-                out.append((ts_local, eur_kwh))
-        except Exception:
-            continue
+def fetch_day_prices_local(target_date: date):
+    """
+    Returns {"date": target_date, "prices": array('d')} where prices[local_hour] = eur_per_kwh
+    (NaN for hours missing from the CSV).
+    Results are cached on disk per (area, date), so restarts/reloads skip the HTTP call;
+    a call made while the same date is already being fetched reuses that result.
+    """
+    key = f"{AREA_FIELD}:{target_date.isoformat()}:hourly"
+    cached = _price_cache.get(key)
+    if cached is not None:
+        return cached
+
+    with _fetch_lock:
+        flight = _fetch_inflight.get(target_date)
+        leader = flight is None
+        if leader:
+            flight = {"done": threading.Event(), "result": None, "error": None}
+            _fetch_inflight[target_date] = flight
+    if not leader:
+        flight["done"].wait()
+        if flight["error"] is not None:
+            raise flight["error"]
+        return flight["result"]
 
-    out.sort(key=lambda x: x[0])
-    return out
+    try:
+        # A previous leader may have filled the cache between our miss and taking the lock
+        cached = _price_cache.get(key)
+        if cached is not None:
+            flight["result"] = cached
+            return cached
+        prices = _download_day_prices(target_date)
+        out = {"date": target_date, "prices": prices}
+        # Don't cache an empty day (prices not published yet) so the next refresh retries
+        if not all(math.isnan(p) for p in prices):
+            today = datetime.now(tz=LOCAL_TZ).date()
+            ttl = PRICE_CACHE_TODAY_TTL_SEC if target_date == today else PRICE_CACHE_TTL_SEC
+            _price_cache.set(key, out, expire=ttl)
+        flight["result"] = out
+        return out
+    except Exception as e:
+        flight["error"] = e
+        raise
+    finally:
+        with _fetch_lock:
+            _fetch_inflight.pop(target_date, None)
+        flight["done"].set()
 
 def build_schedule(prices, threshold):
     """
-    prices: list[(hour_start_local, eur_per_kwh)]
-    returns dict[iso]= {price: float, action: "charge_on"|"charge_off"}
+    prices: {"date": date, "prices": array('d')} as returned by fetch_day_prices_local
+    returns (date, list[24]) where list[hour] = {price: float, action: "charge_on"|"charge_off"} or None
     """
-    sched = {}
-    for ts, price in prices:
-        action = "charge_off" if price > threshold else "charge_on"
-        sched[ts.isoformat()] = {"price": round(price, 5), "action": action}
-    return sched
+    sched = [None if math.isnan(p) else
+             {"price": round(p, 5), "action": "charge_off" if p > threshold else "charge_on"}
+             for p in prices["prices"]]
+    sched_date = prices["date"] if any(sched) else None
+    return sched_date, sched
+
+def _render_schedule_locked():
+    """
+    Re-render the /api/schedule body from day_schedule. Caller must hold state_lock.
+    """
+    rows = [{
+        "hour_local": f"{schedule_date:%Y-%m-%d} {h:02d}:00",
+        "price": v["price"],
+        "action": v["action"]
+    } for h, v in enumerate(day_schedule) if v]
+    payload = orjson.dumps({"rows": rows, "threshold": PRICE_THRESHOLD_EUR_PER_KWH})
+    _schedule_cache["payload"] = payload
+    _schedule_cache["etag"] = f"{time.time_ns():x}"
+
+def set_day_schedule(sched_date, sched):
+    """
+    Replace day_schedule and refresh the cached /api/schedule response.
+    """
+    global schedule_date
+    mask = sum(1 << h for h, v in enumerate(sched) if v and v["action"] == "charge_off")
+    with state_lock:
+        day_schedule[:] = sched
+        schedule_date = sched_date
+        runtime_state["expensive_mask"] = mask
+        _publish_state_locked()
+        _render_schedule_locked()
 
 # ----------------------------
-# BACKGROUND: POLL ARDUINO STATE
+# BACKGROUND: ARDUINO STATE (from the serial thread)
 # ----------------------------
-def arduino_state_poller():
-    while True:
-        try:
-            on, ch = arduino.query_state()
-            now = datetime.now(tz=LOCAL_TZ).isoformat()
-            with state_lock:
-                if on is not None:
-                    runtime_state["inverterEnabled"] = on
-                if ch is not None:
-                    runtime_state["chargerEnabled"] = ch
-                runtime_state["last_state_at"] = now
-        except Exception as e:
-            print(f"[POLL] {e}")
-        time.sleep(STATE_POLL_SEC)
+def on_arduino_state(on, ch):
+    """
+    Called for every STATE line: poll replies and the ones following ON/CH/ALL.
+    """
+    now = datetime.now(tz=LOCAL_TZ).isoformat()
+    with state_lock:
+        runtime_state["inverterEnabled"] = on
+        runtime_state["chargerEnabled"] = ch
+        runtime_state["last_state_at"] = now
+        _publish_state_locked()
 
 # ----------------------------
 # BACKGROUND: PRICE + SCHEDULE + APPLIER
@@ -227,48 +389,48 @@ def price_scheduler():
     """
     - Refresh today's schedule at startup and then every 30 minutes (in case it was empty)
     - At each hour boundary, apply action unless override is 'force_grid'
+    - Sleeps until the next hour boundary; _wake.set() re-applies immediately
     """
     last_hour_applied = None
+    # hoisted to locals for the loop
+    local_tz = LOCAL_TZ
+    _now = datetime.now
     while True:
-        now = datetime.now(tz=LOCAL_TZ)
+        now = _now(tz=local_tz)
         hour_start = now.replace(minute=0, second=0, microsecond=0)
 
         # Refresh schedule if empty or date changed
-        needs_refresh = False
         with state_lock:
-            if not day_schedule:
-                needs_refresh = True
-            else:
-                # check if the keys match today
-                any_key = next(iter(day_schedule.keys()))
-                day_of_sched = datetime.fromisoformat(any_key).astimezone(LOCAL_TZ).date()
-                if day_of_sched != now.date():
-                    needs_refresh = True
+            needs_refresh = schedule_date != now.date()
 
         if needs_refresh:
             try:
                 prices = fetch_day_prices_local(now.date())
-                sched = build_schedule(prices, PRICE_THRESHOLD_EUR_PER_KWH)
-                with state_lock:
-                    day_schedule.clear()
-                    day_schedule.update(sched)
-                expensive = [k[11:13] for k, v in sched.items() if v["action"] == "charge_off"]
-                print(f"[SCHED] Loaded {len(sched)} hours. Expensive (> {PRICE_THRESHOLD_EUR_PER_KWH:.2f} €/kWh): {', '.join(expensive)}")
+                sched_date, sched = build_schedule(prices, PRICE_THRESHOLD_EUR_PER_KWH)
+                set_day_schedule(sched_date, sched)
+                expensive = [f"{h:02d}" for h, v in enumerate(sched) if v and v["action"] == "charge_off"]
+                hours = sum(1 for v in sched if v)
+                print(f"[SCHED] Loaded {hours} hours. Expensive (> {PRICE_THRESHOLD_EUR_PER_KWH:.2f} €/kWh): {', '.join(expensive)}")
             except Exception as e:
                 print(f"[SCHED] fetch/build error: {e}")
 
         # Track current price
         with state_lock:
-            this_hour = day_schedule.get(hour_start.isoformat())
+            this_hour = day_schedule[now.hour] if schedule_date == now.date() else None
             if this_hour:
                 runtime_state["current_price"] = this_hour["price"]
                 runtime_state["current_price_time"] = hour_start.isoformat()
+                _publish_state_locked()
 
         # Apply at hour change or first run
         if last_hour_applied != hour_start:
             with state_lock:
                 ov = runtime_state["override_mode"]
-                action = day_schedule.get(hour_start.isoformat(), {}).get("action")
+                if this_hour:
+                    expensive = (runtime_state["expensive_mask"] >> now.hour) & 1
+                    action = "charge_off" if expensive else "charge_on"
+                else:
+                    action = None
             if ov == "force_grid":
                 # Force charger ON
                 ok = arduino.set_charger(True)
@@ -284,8 +446,15 @@ def price_scheduler():
                     print("[APPLY] no action for this hour")
             last_hour_applied = hour_start
 
-        # sleep a bit, wake roughly every minute
-        time.sleep(55)
+        # Sleep until just past the next hour boundary (or retry sooner while schedule is empty)
+        now = _now(tz=local_tz)
+        timeout = 3600 - (now.minute * 60 + now.second + now.microsecond / 1e6) + 0.5
+        with state_lock:
+            if schedule_date != now.date():
+                timeout = min(timeout, SCHEDULE_RETRY_SEC)
+        if _wake.wait(timeout=max(1, timeout)):
+            _wake.clear()
+            last_hour_applied = None  # woken by reload/override: re-apply this hour
 
 # ----------------------------
 # WEB UI
@@ -350,8 +519,9 @@ th,td{padding:8px;border-bottom:1px solid #eee;text-align:left}
   </div>
 
 <script>
-async function loadState(){
-  const r = await fetch('/api/state'); const j = await r.json();
+async function loadState(fresh){
+  // fresh: skip the short browser cache right after a change
+  const r = await fetch('/api/state', fresh ? {cache:'no-cache'} : {}); const j = await r.json();
   document.getElementById('port').textContent = j.arduino_port || '—';
   const on = document.getElementById('on'); on.textContent = j.inverterEnabled ? 'ENABLED' : 'DISABLED';
   on.className = 'badge ' + (j.inverterEnabled ? 'ok' : 'warn');
@@ -378,7 +548,7 @@ async function loadSchedule(){
 
 async function setOverride(mode){
   await fetch('/api/override', {method:'POST', headers:{'Content-Type':'application/json'}, body: JSON.stringify({mode})});
-  await loadState();
+  await loadState(true);
 }
 
 async function reloadPrices(){
@@ -388,7 +558,7 @@ async function reloadPrices(){
 
 async function sendCmd(kind, val){
   await fetch('/api/command', {method:'POST', headers:{'Content-Type':'application/json'}, body: JSON.stringify({kind, val})});
-  await loadState();
+  await loadState(true);
 }
 
 loadState(); loadSchedule();
@@ -398,28 +568,42 @@ setInterval(()=>{ loadState(); }, 4000);
 </html>
 """
 
+# Encoded/compressed once at import; flask-compress leaves pre-encoded responses alone
+_HTML_BYTES = HTML_PAGE.encode("utf-8")
+_HTML_GZ = gzip.compress(_HTML_BYTES, 6)
+_HTML_ETAG = hashlib.md5(_HTML_BYTES).hexdigest()
+
 @app.route("/")
 def home():
-    return Response(HTML_PAGE, mimetype="text/html")
+    if request.accept_encodings["gzip"]:
+        resp = Response(_HTML_GZ, mimetype="text/html")
+        resp.headers["Content-Encoding"] = "gzip"
+        resp.set_etag(_HTML_ETAG + "-gzip")
+    else:
+        resp = Response(_HTML_BYTES, mimetype="text/html")
+        resp.set_etag(_HTML_ETAG)
+    resp.headers["Vary"] = "Accept-Encoding"
+    resp.headers["Cache-Control"] = "public, max-age=86400"
+    return resp.make_conditional(request)
 
 @app.route("/api/state")
 def api_state():
-    with state_lock:
-        data = dict(runtime_state)
-    return jsonify(data)
+    resp = Response(_state_json_ref[0], mimetype="application/json")
+    resp.headers["Cache-Control"] = "max-age=2, must-revalidate"
+    return resp
 
 @app.route("/api/schedule")
 def api_schedule():
-    rows = []
     with state_lock:
-        for k, v in sorted(day_schedule.items(), key=lambda kv: kv[0]):
-            ts = datetime.fromisoformat(k).astimezone(LOCAL_TZ)
-            rows.append({
-                "hour_local": ts.strftime("%Y-%m-%d %H:%M"),
-                "price": v["price"],
-                "action": v["action"]
-            })
-    return jsonify({"rows": rows, "threshold": PRICE_THRESHOLD_EUR_PER_KWH})
+        if _schedule_cache["payload"] is None:
+            _render_schedule_locked()
+        payload = _schedule_cache["payload"]
+        etag = _schedule_cache["etag"]
+    resp = Response(payload, mimetype="application/json")
+    resp.headers["Cache-Control"] = "no-cache"
+    resp.set_etag(etag)
+    # Answers 304 Not Modified when If-None-Match matches
+    return resp.make_conditional(request)
 
 @app.route("/api/override", methods=["POST"])
 def api_override():
@@ -429,6 +613,8 @@ def api_override():
         return jsonify({"ok": False, "error": "mode must be schedule|force_grid"}), 400
     with state_lock:
         runtime_state["override_mode"] = mode
+        _publish_state_locked()
+    _wake.set()
     return jsonify({"ok": True, "mode": mode})
 
 @app.route("/api/command", methods=["POST"])
@@ -452,11 +638,10 @@ def api_reload():
     now = datetime.now(tz=LOCAL_TZ)
     try:
         prices = fetch_day_prices_local(now.date())
-        sched = build_schedule(prices, PRICE_THRESHOLD_EUR_PER_KWH)
-        with state_lock:
-            day_schedule.clear()
-            day_schedule.update(sched)
-        return jsonify({"ok": True, "hours": len(sched)})
+        sched_date, sched = build_schedule(prices, PRICE_THRESHOLD_EUR_PER_KWH)
+        set_day_schedule(sched_date, sched)
+        _wake.set()
+        return jsonify({"ok": True, "hours": sum(1 for v in sched if v)})
     except Exception as e:
         return jsonify({"ok": False, "error": str(e)}), 500
 
@@ -464,12 +649,12 @@ def api_reload():
 # START BG THREADS + APP
 # ----------------------------
 def main():
-    t1 = threading.Thread(target=arduino_state_poller, daemon=True)
-    t1.start()
-    t2 = threading.Thread(target=price_scheduler, daemon=True)
-    t2.start()
+    arduino.on_state = on_arduino_state
+    arduino.start()
+    t = threading.Thread(target=price_scheduler, daemon=True)
+    t.start()
     print("[WEB] http://localhost:5000")
-    app.run(host="0.0.0.0", port=5000, debug=False, threaded=True)
+    serve(app, host="0.0.0.0", port=5000, threads=8, connection_limit=100)
 
 if __name__ == "__main__":
     main()